@@ -0,0 +1,191 @@
+"""
+Módulo eventos.py
+
+Este módulo define el almacenamiento en memoria de los eventos normalizados.
+
+En lugar de guardar una lista de diccionarios (un dict por evento), los eventos se guardan por columnas:
+una lista por campo (timestamp, host, process, message, severity y tipo de log). Así se evita el coste
+de un diccionario por evento y los recorridos sobre un único campo (p. ej. contar por tipo de log)
+solo tocan la lista de ese campo. La severidad, siempre entre 0 y 10, se guarda como array de bytes.
+
+Los parsers devuelven cada evento como un Evento (clase con __slots__), mucho más ligero que un dict.
+
+Si está instalado pyarrow, los eventos cargados pueden exportarse a Parquet (columnar, comprimido con Snappy)
+y volver a cargarse después sin tener que parsear de nuevo los logs originales.
+"""
+
+from array import array
+
+# Persistencia en Parquet opcional (Apache Arrow)
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    PARQUET_SUPPORT = True
+except ImportError:
+    PARQUET_SUPPORT = False
+
+_COLUMNAS_PARQUET = ["timestamp", "host", "process", "message", "severity", "log_type"]
+
+class Evento:
+    """
+    Evento de log normalizado.
+
+    Los campos se declaran en __slots__ a mano en lugar de con @dataclass(slots=True),
+    que requiere Python 3.10.
+
+    Attributes:
+        timestamp (str): Timestamp en formato ISO 8601 (o el original si no se pudo convertir).
+        host (str): Host de origen.
+        process (str): Proceso o proveedor que generó el evento.
+        message (str): Mensaje del evento.
+        severity (int): Severidad entre 0 y 10.
+        log_type (str): Tipo de log del que procede el evento.
+    """
+
+    __slots__ = ("timestamp", "host", "process", "message", "severity", "log_type")
+
+    def __init__(self, timestamp, host, process, message, severity, log_type=""):
+        self.timestamp = timestamp
+        self.host = host
+        self.process = process
+        self.message = message
+        self.severity = severity
+        self.log_type = log_type
+
+    def __repr__(self):
+        campos = ", ".join(f"{campo}={getattr(self, campo)!r}" for campo in self.__slots__)
+        return f"Evento({campos})"
+
+    def __eq__(self, otro):
+        if type(otro) is not Evento:
+            return NotImplemented
+        return all(getattr(self, campo) == getattr(otro, campo) for campo in self.__slots__)
+
+    __hash__ = None
+
+class ColumnasEventos:
+    """
+    Eventos normalizados almacenados por columnas.
+
+    El evento i-ésimo está formado por el elemento i de cada lista.
+
+    Attributes:
+        timestamps (list): Timestamps normalizados.
+        hosts (list): Hosts de origen.
+        processes (list): Procesos o proveedores.
+        messages (list): Mensajes.
+        severities (array.array): Severidades entre 0 y 10, un byte sin signo por evento
+            (typecode 'B') en lugar de un int de Python.
+        log_types (list): Tipo de log del que procede cada evento.
+    """
+
+    def __init__(self):
+        self.timestamps = []
+        self.hosts = []
+        self.processes = []
+        self.messages = []
+        self.severities = array("B")
+        self.log_types = []
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def __getitem__(self, i):
+        return Evento(self.timestamps[i], self.hosts[i], self.processes[i],
+                      self.messages[i], self.severities[i], self.log_types[i])
+
+    def extender(self, eventos, tipo):
+        """
+        Añade al final los eventos normalizados devueltos por un parser.
+
+        Args:
+            eventos (list): Lista de Evento devuelta por un parser.
+            tipo (str): Tipo de log de todos los eventos añadidos.
+        """
+        self.timestamps.extend(evento.timestamp for evento in eventos)
+        self.hosts.extend(evento.host for evento in eventos)
+        self.processes.extend(evento.process for evento in eventos)
+        self.messages.extend(evento.message for evento in eventos)
+        self.severities.extend(evento.severity for evento in eventos)
+        self.log_types.extend([tipo] * len(eventos))
+
+def _columna_texto(valores):
+    """
+    Convierte una columna de eventos en un array de texto de Arrow.
+
+    Los parsers conservan el tipo del valor original (p. ej. un host numérico en un JSON), que
+    Arrow no admite en una columna de texto: en ese caso los valores se convierten con str().
+
+    Args:
+        valores (list): Valores de la columna.
+
+    Returns:
+        pyarrow.Array: Array de tipo string; los None se guardan como nulos.
+    """
+    try:
+        return pa.array(valores, pa.string())
+    except pa.ArrowException:
+        return pa.array([v if v is None or isinstance(v, str) else str(v) for v in valores], pa.string())
+
+def exportar_parquet(eventos, ruta):
+    """
+    Guarda los eventos cargados en un archivo Parquet comprimido con Snappy.
+
+    Args:
+        eventos (ColumnasEventos): Eventos a exportar.
+        ruta (str): Ruta del archivo Parquet de salida.
+
+    Returns:
+        bool: True si se ha escrito el archivo.
+    """
+    if not PARQUET_SUPPORT:
+        print(" Soporte Parquet no disponible. Instala 'pyarrow'")
+        return False
+    try:
+        tabla = pa.table({
+            "timestamp": _columna_texto(eventos.timestamps),
+            "host": _columna_texto(eventos.hosts),
+            "process": _columna_texto(eventos.processes),
+            "message": _columna_texto(eventos.messages),
+            # El array de bytes se comparte con Arrow sin convertir cada valor
+            "severity": pa.Array.from_buffers(pa.uint8(), len(eventos), [None, pa.py_buffer(eventos.severities)]),
+            "log_type": _columna_texto(eventos.log_types)
+        })
+        pq.write_table(tabla, ruta, compression="snappy")
+    except (OSError, pa.ArrowException) as e:
+        print(" Error escribiendo Parquet:", e)
+        return False
+    print(f" {len(eventos)} eventos exportados a {ruta}")
+    return True
+
+def importar_parquet(ruta, eventos):
+    """
+    Añade a los eventos cargados los de un archivo Parquet generado con exportar_parquet.
+
+    Args:
+        ruta (str): Ruta del archivo Parquet.
+        eventos (ColumnasEventos): Almacén donde se añaden los eventos leídos.
+
+    Returns:
+        int: Número de eventos añadidos.
+    """
+    if not PARQUET_SUPPORT:
+        print(" Soporte Parquet no disponible. Instala 'pyarrow'")
+        return 0
+    # Se convierten todas las columnas antes de añadir ninguna, para que un valor inválido
+    # (p. ej. una severidad nula o mayor que 255) no deje las columnas con distinta longitud
+    try:
+        tabla = pq.read_table(ruta, columns=_COLUMNAS_PARQUET)
+        columnas = {campo: tabla.column(campo).to_pylist() for campo in _COLUMNAS_PARQUET}
+        severities = array("B", columnas["severity"])
+    except (OSError, pa.ArrowException, TypeError, OverflowError) as e:
+        print(" Error leyendo Parquet:", e)
+        return 0
+    eventos.timestamps.extend(columnas["timestamp"])
+    eventos.hosts.extend(columnas["host"])
+    eventos.processes.extend(columnas["process"])
+    eventos.messages.extend(columnas["message"])
+    eventos.severities.extend(severities)
+    eventos.log_types.extend(columnas["log_type"])
+    print(f" Parquet cargado con {tabla.num_rows} eventos.")
+    return tabla.num_rows
@@ -10,8 +10,18 @@ Funciones principales:
 - menu_ingesta: Menú para seleccionar el tipo de archivo de log a cargar.
 - mostrar_eventos: Muestra los primeros eventos cargados.
 - resumen_eventos: Muestra un resumen de los eventos cargados.
+- exportar_eventos: Exporta los eventos cargados a Parquet.
+- ingesta_por_lotes: Carga varios archivos en paralelo sin interacción (opción --ingest).
+- main: Punto de entrada; usa el modo por lotes si se indican archivos y, si no, el menú interactivo.
 """
 
+import argparse
+import os
+import sys
+import tempfile
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
 from parser import (
     guardar_en_temporal,
     procesar_csv,
@@ -21,14 +31,24 @@ from parser import (
     procesar_evtx,
     EVTX_SUPPORT
 )
+from eventos import ColumnasEventos, exportar_parquet, importar_parquet
+
+# Tipo de archivo en --ingest -> (parser, tipo de log de los eventos)
+_INGESTA = {
+    "csv": (procesar_csv, "CSV_Linux"),
+    "csv_windows": (procesar_csv_windows, "CSV_Windows"),
+    "json": (procesar_json, "JSON"),
+    "syslog": (procesar_syslog, "SYSLOG"),
+    "evtx": (procesar_evtx, "EVTX_Windows")
+}
 
 def menu_ingesta(datos_cargados):
     """
     Muestra el menú de ingesta de logs y permite al usuario seleccionar el tipo de archivo a cargar.
-    Procesa el archivo seleccionado y añade los eventos normalizados a la lista de datos cargados.
+    Procesa el archivo seleccionado y añade los eventos normalizados a los datos cargados.
 
     Args:
-        datos_cargados (list): Lista donde se almacenan los eventos cargados.
+        datos_cargados (ColumnasEventos): Almacén donde se añaden los eventos cargados.
     """
     while True:
         print("\n--- Ingesta de logs ---")
@@ -37,14 +57,15 @@ def menu_ingesta(datos_cargados):
         print("3. SYSLOG (.log)")
         print("4. CSV Windows")
         print("5. EVTX Windows")
-        print("6. Volver al menú principal")
+        print("6. Parquet (eventos exportados)")
+        print("7. Volver al menú principal")
 
         opcion = input("Seleccione una opción: ")
 
-        if opcion == "6":
+        if opcion == "7":
             break
 
-        if opcion not in ["1","2","3","4","5"]:
+        if opcion not in ["1","2","3","4","5","6"]:
             print("Opción no válida.")
             continue
 
@@ -53,6 +74,12 @@ def menu_ingesta(datos_cargados):
         if not ruta_temp:
             continue
 
+        if opcion == "6":
+            # Los eventos exportados ya están normalizados y llevan su tipo de log
+            if importar_parquet(ruta_temp, datos_cargados):
+                print(f"Total eventos cargados hasta ahora: {len(datos_cargados)}")
+            continue
+
         if opcion == "1":
             nuevos_datos = procesar_csv(ruta_temp)
             tipo = "CSV_Linux"
@@ -70,9 +97,7 @@ def menu_ingesta(datos_cargados):
             tipo = "EVTX_Windows"
 
         if nuevos_datos:
-            for evento in nuevos_datos:
-                evento["_log_type"] = tipo
-            datos_cargados.extend(nuevos_datos)
+            datos_cargados.extender(nuevos_datos, tipo)
             print(f"Total eventos cargados hasta ahora: {len(datos_cargados)}")
         else:
             print("No se han cargado eventos de este archivo.")
@@ -82,48 +107,61 @@ def mostrar_eventos(datos_cargados):
     Muestra los primeros 3 eventos normalizados de los datos cargados.
 
     Args:
-        datos_cargados (list): Lista de eventos cargados.
+        datos_cargados (ColumnasEventos): Eventos cargados.
     """
     if not datos_cargados:
         print("No hay datos cargados.")
         return
     print("\n=== Primeros 3 eventos normalizados ===")
-    for evento in datos_cargados[:3]:
-        print(f"timestamp: {evento['timestamp']}, host: {evento['host']}, "
-              f"process: {evento['process']}, severity: {evento['severity']}, "
-              f"message: {evento['message'][:80]}{'...' if len(evento['message'])>80 else ''}")
+    for i in range(min(3, len(datos_cargados))):
+        evento = datos_cargados[i]
+        mensaje = evento.message
+        print(f"timestamp: {evento.timestamp}, host: {evento.host}, "
+              f"process: {evento.process}, severity: {evento.severity}, "
+              f"message: {mensaje[:80]}{'...' if len(mensaje)>80 else ''}")
 
 def resumen_eventos(datos_cargados):
     """
     Muestra un resumen de la cantidad total de eventos cargados y su distribución por tipo de log.
 
     Args:
-        datos_cargados (list): Lista de eventos cargados.
+        datos_cargados (ColumnasEventos): Eventos cargados.
     """
     if not datos_cargados:
         print("No hay datos cargados.")
         return
     print("\n=== Resumen de eventos cargados ===")
     print(f"Total eventos: {len(datos_cargados)}")
-    tipos = {}
-    for evento in datos_cargados:
-        tipo = evento.get("_log_type", "Desconocido")
-        tipos[tipo] = tipos.get(tipo, 0) + 1
+    tipos = Counter(datos_cargados.log_types)
     for tipo, cantidad in tipos.items():
         print(f"{tipo}: {cantidad} eventos")
 
+def exportar_eventos(datos_cargados):
+    """
+    Exporta los eventos cargados a un archivo Parquet para reutilizarlos sin volver a parsear los logs.
+
+    Args:
+        datos_cargados (ColumnasEventos): Eventos cargados.
+    """
+    if not datos_cargados:
+        print("No hay datos cargados.")
+        return
+    ruta = input("Introduzca la ruta del archivo Parquet de salida: ")
+    exportar_parquet(datos_cargados, ruta)
+
 def menu_principal():
     """
     Muestra el menú principal de la aplicación y gestiona la navegación entre las diferentes opciones.
     """
-    datos_cargados = []
+    datos_cargados = ColumnasEventos()
 
     while True:
         print("\n=== SOC Automation Toolkit ===")
         print("1. Ingesta de logs")
         print("2. Mostrar primeros 3 eventos cargados")
         print("3. Resumen de eventos cargados")
-        print("4. Salir")
+        print("4. Exportar eventos a Parquet")
+        print("5. Salir")
 
         opcion = input("Seleccione una opción: ")
 
@@ -134,10 +172,127 @@ def menu_principal():
         elif opcion == "3":
             resumen_eventos(datos_cargados)
         elif opcion == "4":
+            exportar_eventos(datos_cargados)
+        elif opcion == "5":
             print("Saliendo...")
             break
         else:
             print("Opción no válida.")
 
+def _archivo_ingesta(valor):
+    """
+    Convierte un argumento 'tipo:ruta' de --ingest en la tupla (tipo, ruta).
+
+    Args:
+        valor (str): Argumento recibido por la línea de comandos.
+
+    Returns:
+        tuple: (tipo, ruta).
+    """
+    tipo, _, ruta = valor.partition(":")
+    if tipo not in _INGESTA or not ruta:
+        raise argparse.ArgumentTypeError(
+            f"'{valor}' no tiene el formato tipo:ruta (tipos: {', '.join(_INGESTA)})")
+    return tipo, ruta
+
+def _ingerir(tipo, ruta, procesos):
+    """
+    Procesa un archivo con el parser de su tipo.
+
+    Args:
+        tipo (str): Tipo de archivo (clave de _INGESTA).
+        ruta (str): Ruta del archivo en la carpeta temporal.
+        procesos (int): Procesos que puede usar el parser para repartir un archivo grande.
+
+    Returns:
+        list: Lista de eventos normalizados (Evento).
+    """
+    procesar = _INGESTA[tipo][0]
+    # Solo los formatos por líneas se reparten por trozos entre varios procesos
+    if tipo in ("json", "syslog"):
+        return procesar(ruta, procesos)
+    return procesar(ruta)
+
+def ingesta_por_lotes(archivos, datos_cargados, procesos):
+    """
+    Carga varios archivos de log sin interacción, procesándolos en paralelo.
+
+    Cada archivo se procesa en un proceso distinto y sus eventos se añaden según van terminando.
+    Los procesos se reparten entre los archivos y, dentro de cada uno, entre sus trozos.
+
+    Args:
+        archivos (list): Tuplas (tipo, ruta) con los archivos a cargar.
+        datos_cargados (ColumnasEventos): Almacén donde se añaden los eventos cargados.
+        procesos (int): Número máximo de procesos.
+
+    Returns:
+        int: Número de archivos que no se han podido preparar y se han omitido.
+    """
+    # Cada ejecución copia los archivos a su propia carpeta temporal, que se borra al terminar
+    with tempfile.TemporaryDirectory(prefix="soc_toolkit_") as directorio:
+        pendientes = []
+        for i, (tipo, ruta) in enumerate(archivos):
+            # Una subcarpeta por archivo: dos logs con el mismo nombre no se sustituyen
+            carpeta = os.path.join(directorio, str(i))
+            os.mkdir(carpeta)
+            ruta_temp = guardar_en_temporal(ruta, carpeta)
+            if ruta_temp:
+                pendientes.append((tipo, ruta_temp))
+        omitidos = len(archivos) - len(pendientes)
+        if not pendientes:
+            return omitidos
+
+        trabajadores = min(procesos, len(pendientes))
+        procesos_por_archivo = max(1, procesos // trabajadores)
+        if trabajadores == 1:
+            # Sin reparto entre archivos no compensa arrancar procesos: se procesan aquí mismo
+            for tipo, ruta in pendientes:
+                datos_cargados.extender(_ingerir(tipo, ruta, procesos_por_archivo), _INGESTA[tipo][1])
+            return omitidos
+        with ProcessPoolExecutor(max_workers=trabajadores) as ejecutor:
+            futuros = {
+                ejecutor.submit(_ingerir, tipo, ruta, procesos_por_archivo): tipo
+                for tipo, ruta in pendientes
+            }
+            for futuro in as_completed(futuros):
+                datos_cargados.extender(futuro.result(), _INGESTA[futuros[futuro]][1])
+    return omitidos
+
+def main(argv=None):
+    """
+    Punto de entrada de la aplicación.
+
+    Con --ingest carga los archivos indicados, muestra el resumen y, si se pide, exporta a Parquet;
+    sin argumentos abre el menú interactivo. En modo por lotes exporta los eventos cargados aunque falte
+    algún archivo y termina con código 1 si algún archivo no se ha podido preparar, si no se ha cargado
+    ningún evento o si falla la exportación.
+
+    Args:
+        argv (list, optional): Argumentos de la línea de comandos; por defecto, los de sys.argv.
+    """
+    argumentos = argparse.ArgumentParser(description="SOC Automation Toolkit")
+    argumentos.add_argument("--ingest", nargs="+", type=_archivo_ingesta, metavar="TIPO:RUTA",
+                            help=f"archivos de log a cargar sin interacción (tipos: {', '.join(_INGESTA)})")
+    argumentos.add_argument("--parallel", type=int, default=1, metavar="N",
+                            help="número máximo de procesos (por defecto, 1)")
+    argumentos.add_argument("--parquet", metavar="RUTA",
+                            help="exporta los eventos cargados a este archivo Parquet")
+    args = argumentos.parse_args(argv)
+    if args.parallel < 1:
+        argumentos.error("--parallel debe ser al menos 1")
+
+    if not args.ingest:
+        menu_principal()
+        return
+    datos_cargados = ColumnasEventos()
+    omitidos = ingesta_por_lotes(args.ingest, datos_cargados, args.parallel)
+    resumen_eventos(datos_cargados)
+    exportado = True
+    if args.parquet and datos_cargados:
+        # Se exporta lo cargado aunque falte algún archivo; el código de salida informa después del fallo
+        exportado = exportar_parquet(datos_cargados, args.parquet)
+    if omitidos or not datos_cargados or not exportado:
+        sys.exit(1)
+
 if __name__ == "__main__":
-    menu_principal()
+    main()
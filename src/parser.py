@@ -11,13 +11,21 @@ Incluye utilidades para copiar archivos a una carpeta temporal, normalizar times
 y convertir los eventos de logs a un formato homogéneo para su posterior análisis.
 """
 
+import io
+import mmap
 import os
 import shutil
 import tempfile
 import json
 import csv
 import re
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import contextmanager
 from datetime import datetime
+from functools import lru_cache
+from itertools import repeat
+
+from eventos import Evento
 
 # Soporte EVTX opcional
 try:
@@ -27,12 +35,229 @@ try:
 except ImportError:
     EVTX_SUPPORT = False
 
-def guardar_en_temporal(ruta_archivo):
+# Espacio de nombres de los registros EVTX renderizados a XML
+_NS_EVTX = {"e": "http://schemas.microsoft.com/win/2004/08/events/event"}
+
+# XPath precompilado con lxml (opcional) para extraer los campos de cada registro EVTX
+try:
+    from lxml import etree
+    _XPATH_EVTX = {
+        campo: etree.XPath(f"string({ruta})", namespaces=_NS_EVTX, smart_strings=False)
+        for campo, ruta in {
+            "timestamp": "e:System/e:TimeCreated/@SystemTime",
+            "host": "e:System/e:Computer",
+            "process": "e:System/e:Provider/@Name",
+            "message": "e:RenderingInfo/e:Message",
+            "severity": "e:System/e:Level"
+        }.items()
+    }
+    LXML_SUPPORT = True
+except ImportError:
+    LXML_SUPPORT = False
+
+# División de líneas SYSLOG compilada con Cython (opcional, ver parser_fast.pyx)
+try:
+    from parser_fast import dividir_lineas_syslog
+    PARSER_FAST_SUPPORT = True
+except ImportError:
+    PARSER_FAST_SUPPORT = False
+
+# Parser JSON acelerado opcional (acepta bytes UTF-8 directamente)
+try:
+    import orjson
+    _json_loads = orjson.loads
+except ImportError:
+    _json_loads = json.loads
+
+# Lector CSV columnar opcional (Apache Arrow)
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.csv as pa_csv
+    ARROW_SUPPORT = True
+except ImportError:
+    ARROW_SUPPORT = False
+
+# Motor de expresiones regulares RE2 opcional (tiempo lineal, sin backtracking)
+try:
+    import re2
+    RE2_SUPPORT = True
+except ImportError:
+    RE2_SUPPORT = False
+
+# Campo normalizado -> (columna del CSV, valor si la columna no existe)
+_COLUMNAS_CSV = {
+    "timestamp": ("timestamp", ""),
+    "host": ("host", ""),
+    "process": ("process", ""),
+    "message": ("message", ""),
+    "severity": ("severity", 0)
+}
+_COLUMNAS_CSV_WINDOWS = {
+    "timestamp": ("TimeCreated", ""),
+    "host": ("Computer", ""),
+    "process": ("ProviderName", "unknown"),
+    "message": ("Message", ""),
+    "severity": ("Level", 0)
+}
+
+# Tamaño a partir del cual los archivos por líneas se reparten entre varios procesos
+_TAM_MIN_PARALELO = 32 * 1024 * 1024
+
+# Meses abreviados de los timestamps syslog
+_MESES = {
+    "Jan": 1, "Feb": 2, "Mar": 3, "Apr": 4, "May": 5, "Jun": 6,
+    "Jul": 7, "Aug": 8, "Sep": 9, "Oct": 10, "Nov": 11, "Dec": 12
+}
+
+# Formato syslog clásico: 'Sep  2 17:38:51 host proceso[pid]: mensaje'
+_SYSLOG_RE = re.compile(r'^(\w+\s+\d+\s+\d+:\d+:\d+)\s+(\S+)\s+([^:]+):\s+(.*)$')
+
+# Con RE2 las líneas mal formadas se descartan en tiempo lineal. RE2 interpreta \w, \d y \s
+# solo como ASCII, así que se escriben las clases Unicode equivalentes a las de re
+if RE2_SUPPORT:
+    _ESPACIOS = r'\t-\r\x1c-\x1f \x85\xa0\x{1680}\x{2000}-\x{200a}\x{2028}\x{2029}\x{202f}\x{205f}\x{3000}'
+    _SYSLOG_RE = re2.compile(
+        r'^([\p{L}\p{N}_]+[ESP]+\p{Nd}+[ESP]+\p{Nd}+:\p{Nd}+:\p{Nd}+)[ESP]+([^ESP]+)[ESP]+([^:]+):[ESP]+(.*)$'
+        .replace("ESP", _ESPACIOS)
+    )
+
+# Misma línea en su forma canónica y ASCII (salvo el interior del mensaje), para buscar
+# sobre el buffer completo del archivo; las líneas que no encajan pasan por _SYSLOG_RE
+_SYSLOG_CANONICO_RE = re.compile(
+    rb'^([A-Za-z]{3} [ 0-9][0-9] [0-9]{2}:[0-9]{2}:[0-9]{2}) ([!-~]+) ([!-9;-~][ -9;-~]*):[ \t]+'
+    rb'([!-~](?:[^\n]*[!-~])?)[\t\x0b\x0c\r\x1c-\x1f ]*$',
+    re.MULTILINE
+)
+
+# Retorno de carro suelto, que la lectura en modo texto original (universal newlines) trataba
+# como salto de línea igual que \n y \r\n
+_CR_SUELTO_RE = re.compile(rb'\r(?!\n)')
+_SALTO_UNIVERSAL_RE = re.compile(rb'\r\n|\r|\n')
+
+def _dividir_syslog(linea):
+    """
+    Divide una línea syslog de cabecera fija sin recurrir a la expresión regular.
+
+    Solo acepta el caso canónico (timestamp 'Mmm dd hh:mm:ss' de 15 caracteres ASCII separado por
+    espacios simples); cualquier otra variante lanza ValueError para que el llamador recurra a _SYSLOG_RE.
+
+    Args:
+        linea (str): Línea sin salto de línea final.
+
+    Returns:
+        tuple: (timestamp, host, proceso, mensaje).
+    """
+    if linea[3:16:3] != "  :: ":
+        raise ValueError("cabecera syslog no canónica")
+    # Mes de tres letras; día (espacio o dígito y un dígito), horas, minutos y segundos en dígitos ASCII
+    digitos = linea[5] + linea[7:9] + linea[10:12] + linea[13:15]
+    if (not (linea[:3] + digitos).isascii() or not linea[:3].isalpha() or not digitos.isdigit()
+            or linea[4] not in " 0123456789"):
+        raise ValueError("cabecera syslog no canónica")
+    host, resto = linea[16:].split(" ", 1)
+    fin_proceso = resto.index(":")
+    mensaje = resto[fin_proceso + 1:]
+    if not host or not host.isprintable() or not fin_proceso or resto[0].isspace() or not mensaje[:1].isspace():
+        raise ValueError("línea syslog no canónica")
+    return linea[:15], host, resto[:fin_proceso], mensaje.lstrip()
+
+def _leer_archivo(ruta):
+    """
+    Lee el archivo completo en memoria de una sola vez.
+
+    Al abrirlo sin buffer, Python reserva el tamaño del archivo y lo lee con una única
+    llamada read() en lugar de ir pidiendo bloques de 8 KB mientras se itera.
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Returns:
+        bytes: Contenido del archivo.
+    """
+    with open(ruta, "rb", buffering=0) as f:
+        return f.read()
+
+@contextmanager
+def _mapear_archivo(ruta):
+    """
+    Proyecta el archivo en memoria (mmap) en modo solo lectura.
+
+    El sistema operativo carga las páginas bajo demanda, sin copiar el archivo a un buffer
+    de Python ni hacer una llamada read() por bloque.
+
+    Args:
+        ruta (str): Ruta del archivo.
+
+    Yields:
+        mmap.mmap or io.BytesIO: Objeto con readline() sobre el contenido del archivo
+        (BytesIO vacío si el archivo está vacío, ya que mmap no admite longitud 0).
+    """
+    with open(ruta, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            yield io.BytesIO()
+            return
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapa:
+            yield mapa
+
+def _copiar_en_kernel(copiar, copiado, tamano):
+    """
+    Repite una llamada de copia del kernel hasta completar el archivo o hasta que deje de avanzar.
+
+    Args:
+        copiar (callable): Función copiar(desde, cantidad) que devuelve los bytes copiados.
+        copiado (int): Bytes ya copiados.
+        tamano (int): Tamaño total del archivo.
+
+    Returns:
+        int: Bytes copiados en total; menos de tamano si la llamada no está soportada.
+    """
+    try:
+        while copiado < tamano:
+            enviados = copiar(copiado, tamano - copiado)
+            if not enviados:
+                break
+            copiado += enviados
+    except OSError:
+        pass
+    return copiado
+
+def _copiar_archivo(origen, destino):
+    """
+    Copia un archivo sin pasar los datos por buffers de Python y conserva sus metadatos (como shutil.copy2).
+
+    Intenta copy_file_range (que permite reflinks en Btrfs/XFS), después sendfile, y como último recurso
+    termina la copia por bloques desde donde se hayan quedado los anteriores.
+
+    Args:
+        origen (str): Ruta del archivo original.
+        destino (str): Ruta de la copia.
+    """
+    with open(origen, "rb", buffering=0) as f_origen, open(destino, "wb", buffering=0) as f_destino:
+        entrada, salida = f_origen.fileno(), f_destino.fileno()
+        tamano = os.fstat(entrada).st_size
+        copiado = 0
+        if hasattr(os, "copy_file_range"):
+            copiado = _copiar_en_kernel(lambda desde, n: os.copy_file_range(entrada, salida, n, desde),
+                                        copiado, tamano)
+        if copiado < tamano and hasattr(os, "sendfile"):
+            copiado = _copiar_en_kernel(lambda desde, n: os.sendfile(salida, entrada, desde, n),
+                                        copiado, tamano)
+        if copiado < tamano:
+            f_origen.seek(copiado)
+            shutil.copyfileobj(f_origen, f_destino)
+    shutil.copystat(origen, destino)
+
+def guardar_en_temporal(ruta_archivo, directorio=None):
     """
     Copia el archivo especificado a la carpeta temporal del sistema.
 
+    Se copia en lugar de enlazarlo porque los parsers leen el archivo con mmap: si el log original
+    se truncase o rotase durante la lectura, el proceso recibiría SIGBUS.
+
     Args:
         ruta_archivo (str): Ruta absoluta del archivo a copiar.
+        directorio (str, optional): Carpeta donde dejar la copia; por defecto, la temporal del sistema.
 
     Returns:
         str or None: Ruta del archivo copiado en la carpeta temporal, o None si falla.
@@ -41,15 +266,51 @@ def guardar_en_temporal(ruta_archivo):
         print(" Error: la ruta no existe o no es un archivo.")
         return None
     nombre_archivo = os.path.basename(ruta_archivo)
-    ruta_temporal = os.path.join(tempfile.gettempdir(), nombre_archivo)
-    shutil.copy2(ruta_archivo, ruta_temporal)
+    ruta_temporal = os.path.join(directorio or tempfile.gettempdir(), nombre_archivo)
+    if os.path.islink(ruta_temporal) and os.path.abspath(ruta_temporal) != os.path.abspath(ruta_archivo):
+        # Se elimina antes de copiar para no escribir a través de un enlace antiguo
+        os.remove(ruta_temporal)
+    if os.path.realpath(ruta_temporal) == os.path.realpath(ruta_archivo):
+        # El archivo ya está en la carpeta temporal: copiarlo sobre sí mismo lo vaciaría
+        print(f" Log disponible en carpeta temporal: {ruta_temporal}")
+        return ruta_temporal
+    _copiar_archivo(ruta_archivo, ruta_temporal)
     print(f" Log copiado a carpeta temporal: {ruta_temporal}")
     return ruta_temporal
 
+def _timestamp_syslog(ts):
+    """
+    Convierte un timestamp syslog ('Sep 02 17:23:54') a ISO 8601 sin pasar por strptime,
+    que reinterpreta el formato y consulta el locale en cada llamada.
+
+    Args:
+        ts (str): Timestamp syslog con el mes abreviado en inglés.
+
+    Returns:
+        str: Timestamp en formato ISO 8601 (año 1900, como strptime).
+
+    Raises:
+        KeyError: Si el mes no es una abreviatura inglesa.
+        ValueError: Si el resto del timestamp no tiene el formato esperado.
+    """
+    if ts[:1].isspace() or ts[-1:].isspace():
+        raise ValueError("espacios en los extremos del timestamp")
+    mes, dia, hora = ts.split()
+    horas, minutos, segundos = hora.split(":")
+    # Solo dígitos ASCII (int() admitiría signos, '_' y dígitos Unicode): día de 1 o 2 y el resto de 2
+    if not (len(dia) <= 2 and len(horas) == len(minutos) == len(segundos) == 2
+            and (dia + horas + minutos + segundos).isascii() and (dia + horas + minutos + segundos).isdigit()):
+        raise ValueError("timestamp syslog no canónico")
+    return datetime(1900, _MESES[mes], int(dia), int(horas), int(minutos), int(segundos)).isoformat()
+
+@lru_cache(maxsize=65536)
 def normalizar_timestamp(ts):
     """
     Convierte un timestamp a formato ISO 8601 si es posible.
 
+    Los resultados se cachean: en un mismo log es habitual que muchos eventos compartan
+    el mismo timestamp (misma resolución de segundo).
+
     Args:
         ts (str): Timestamp de entrada.
 
@@ -64,11 +325,27 @@ def normalizar_timestamp(ts):
     except ValueError:
         try:
             # Intento parseo de syslog (Linux): 'Sep 02 17:23:54'
+            return _timestamp_syslog(ts)
+        except (KeyError, ValueError):
+            pass
+        try:
+            # Meses en otra capitalización o en el idioma del locale
             dt = datetime.strptime(ts, "%b %d %H:%M:%S")
             return dt.isoformat()
         except ValueError:
             return ts
 
+@lru_cache(maxsize=256)
+def _severity_normalizada(sev):
+    """
+    Versión cacheada de normalizar_severity; solo admite valores hashables.
+    """
+    try:
+        sev = int(sev)
+        return max(0, min(sev, 10))
+    except (TypeError, ValueError):
+        return 0
+
 def normalizar_severity(sev):
     """
     Normaliza el valor de severidad a un entero entre 0 y 10.
@@ -80,11 +357,85 @@ def normalizar_severity(sev):
         int: Severidad normalizada.
     """
     try:
-        sev = int(sev)
-        return max(0, min(sev, 10))
-    except (TypeError, ValueError):
+        return _severity_normalizada(sev)
+    except TypeError:
+        # Valores no hashables (p. ej. listas en JSON): no se pueden cachear ni convertir
         return 0
 
+def _normalizar_timestamps_arrow(valores):
+    """
+    Aplica normalizar_timestamp a una columna Arrow evaluando cada valor distinto una sola vez.
+
+    Args:
+        valores (pyarrow.ChunkedArray): Columna de timestamps en texto.
+
+    Returns:
+        pyarrow.ChunkedArray: Columna de timestamps normalizados.
+    """
+    unicos = pc.unique(valores)
+    normalizados = pa.array([normalizar_timestamp(ts) for ts in unicos.to_pylist()], pa.string())
+    return pc.take(normalizados, pc.index_in(valores, value_set=unicos))
+
+def _normalizar_severities_arrow(valores):
+    """
+    Aplica normalizar_severity a una columna Arrow evaluando cada valor distinto una sola vez,
+    con la misma conversión int() que el resto de parsers (signos, espacios y dígitos Unicode).
+
+    Args:
+        valores (pyarrow.ChunkedArray): Columna de severidades en texto.
+
+    Returns:
+        pyarrow.ChunkedArray: Columna de enteros entre 0 y 10.
+    """
+    unicos = pc.unique(valores)
+    normalizadas = pa.array([normalizar_severity(sev) for sev in unicos.to_pylist()], pa.int64())
+    return pc.take(normalizadas, pc.index_in(valores, value_set=unicos))
+
+def _leer_csv_arrow(ruta, columnas):
+    """
+    Lee y normaliza un CSV con el lector columnar de Arrow, sin bucles por fila en Python.
+
+    Args:
+        ruta (str): Ruta del archivo CSV.
+        columnas (dict): Campo normalizado -> (columna del CSV, valor si la columna no existe).
+
+    Returns:
+        list or None: Eventos normalizados, o None si Arrow no puede leer el archivo, la cabecera
+        está vacía o repite nombres, o alguna fila no tiene el número de columnas de la cabecera,
+        y hay que recurrir al módulo csv (csv.DictReader conserva esas filas y completa los campos
+        que faltan con None).
+    """
+    # Cabecera tal como la lee csv.DictReader (BOM incluido). Con nombres repetidos Arrow toma
+    # la primera columna y DictReader la última, así que ese caso se deja al módulo csv
+    with open(ruta, newline="", encoding="utf-8", errors="ignore") as f:
+        cabecera = next(csv.reader(f), [])
+    if not cabecera or len(set(cabecera)) != len(cabecera):
+        return None
+    origenes = [origen for origen, _ in columnas.values()]
+    try:
+        tabla = pa_csv.read_csv(
+            ruta,
+            read_options=pa_csv.ReadOptions(column_names=cabecera, skip_rows_after_names=1),
+            parse_options=pa_csv.ParseOptions(newlines_in_values=True,
+                                              invalid_row_handler=lambda fila: "error"),
+            convert_options=pa_csv.ConvertOptions(column_types={origen: pa.string() for origen in origenes},
+                                                  include_columns=origenes,
+                                                  include_missing_columns=True)
+        )
+        salida = {}
+        for campo, (origen, defecto) in columnas.items():
+            valores = tabla.column(origen).fill_null(str(defecto))
+            if campo == "timestamp":
+                valores = _normalizar_timestamps_arrow(valores)
+            elif campo == "severity":
+                valores = _normalizar_severities_arrow(valores)
+            salida[campo] = valores
+        # _COLUMNAS_CSV* siguen el orden de los campos de Evento
+        datos = list(map(Evento, *(valores.to_pylist() for valores in salida.values())))
+    except pa.ArrowException:
+        return None
+    return datos
+
 def procesar_csv(ruta):
     """
     Procesa un archivo CSV (Linux/otros) y normaliza los eventos.
@@ -93,23 +444,25 @@ def procesar_csv(ruta):
         ruta (str): Ruta del archivo CSV.
 
     Returns:
-        list: Lista de eventos normalizados.
+        list: Lista de eventos normalizados (Evento).
     """
     if not ruta.endswith(".csv"):
         print(" Atención: el archivo no tiene extensión .csv")
-    datos = []
+    datos = _leer_csv_arrow(ruta, _COLUMNAS_CSV) if ARROW_SUPPORT else None
     lineas_invalidas = 0
-    with open(ruta, newline='', encoding="utf-8", errors="ignore") as f:
-        lector = csv.DictReader(f)
+    if datos is None:
+        datos = []
+        texto = _leer_archivo(ruta).decode("utf-8", errors="ignore")
+        lector = csv.DictReader(io.StringIO(texto, newline=''))
         for fila in lector:
             try:
-                datos.append({
-                    "timestamp": normalizar_timestamp(fila.get("timestamp", "")),
-                    "host": fila.get("host", ""),
-                    "process": fila.get("process", ""),
-                    "message": fila.get("message", ""),
-                    "severity": normalizar_severity(fila.get("severity", 0))
-                })
+                datos.append(Evento(
+                    timestamp=normalizar_timestamp(fila.get("timestamp", "")),
+                    host=fila.get("host", ""),
+                    process=fila.get("process", ""),
+                    message=fila.get("message", ""),
+                    severity=normalizar_severity(fila.get("severity", 0))
+                ))
             except Exception:
                 lineas_invalidas += 1
     print(f" CSV cargado con {len(datos)} eventos normalizados, {lineas_invalidas} líneas inválidas.")
@@ -123,93 +476,325 @@ def procesar_csv_windows(ruta):
         ruta (str): Ruta del archivo CSV.
 
     Returns:
-        list: Lista de eventos normalizados.
+        list: Lista de eventos normalizados (Evento).
     """
     if not ruta.endswith(".csv"):
         print(" Atención: el archivo no tiene extensión .csv")
-    datos = []
+    datos = _leer_csv_arrow(ruta, _COLUMNAS_CSV_WINDOWS) if ARROW_SUPPORT else None
     lineas_invalidas = 0
-    with open(ruta, newline='', encoding="utf-8", errors="ignore") as f:
-        lector = csv.DictReader(f)
+    if datos is None:
+        datos = []
+        texto = _leer_archivo(ruta).decode("utf-8", errors="ignore")
+        lector = csv.DictReader(io.StringIO(texto, newline=''))
         for fila in lector:
             try:
-                datos.append({
-                    "timestamp": normalizar_timestamp(fila.get("TimeCreated", "")),
-                    "host": fila.get("Computer", ""),
-                    "process": fila.get("ProviderName", "unknown"),
-                    "message": fila.get("Message", ""),
-                    "severity": normalizar_severity(fila.get("Level", 0))
-                })
+                datos.append(Evento(
+                    timestamp=normalizar_timestamp(fila.get("TimeCreated", "")),
+                    host=fila.get("Computer", ""),
+                    process=fila.get("ProviderName", "unknown"),
+                    message=fila.get("Message", ""),
+                    severity=normalizar_severity(fila.get("Level", 0))
+                ))
             except Exception:
                 lineas_invalidas += 1
     print(f" CSV de Windows cargado con {len(datos)} eventos normalizados, {lineas_invalidas} líneas inválidas.")
     return datos
 
-def procesar_json(ruta):
+def _limites_de_trozos(ruta, tamano, partes):
     """
-    Procesa un archivo JSON o NDJSON de logs y normaliza los eventos.
+    Calcula los offsets que dividen un archivo de texto en trozos que empiezan en inicio de línea.
+
+    Args:
+        ruta (str): Ruta del archivo.
+        tamano (int): Tamaño del archivo en bytes.
+        partes (int): Número de trozos deseado.
+
+    Returns:
+        list: Offsets [0, ..., tamano]; el trozo i va de limites[i] a limites[i + 1].
+    """
+    limites = [0]
+    with _mapear_archivo(ruta) as mapa:
+        for i in range(1, partes):
+            salto = mapa.find(b"\n", max(tamano * i // partes, limites[-1]))
+            if salto == -1:
+                break
+            limites.append(salto + 1)
+    limites.append(tamano)
+    return limites
+
+def _parsear_en_columnas(parsear, ruta, inicio, fin):
+    """
+    Ejecuta un parser por líneas sobre un trozo y devuelve sus eventos por columnas.
+
+    Se usa en los procesos auxiliares: devolver listas de valores en lugar de una lista de Evento
+    hace que el resultado se serialice y se reciba en el proceso principal mucho más rápido.
+
+    Args:
+        parsear (callable): Función parsear(ruta, inicio, fin) -> (eventos, líneas inválidas).
+        ruta (str): Ruta del archivo.
+        inicio (int): Offset de la primera línea del trozo.
+        fin (int): Offset donde empieza la primera línea que ya no pertenece al trozo.
+
+    Returns:
+        tuple: (timestamps, hosts, procesos, mensajes, severidades, líneas inválidas).
+    """
+    eventos, lineas_invalidas = parsear(ruta, inicio, fin)
+    return (
+        [evento.timestamp for evento in eventos],
+        [evento.host for evento in eventos],
+        [evento.process for evento in eventos],
+        [evento.message for evento in eventos],
+        [evento.severity for evento in eventos],
+        lineas_invalidas
+    )
+
+def _procesar_por_trozos(parsear, ruta, procesos=1):
+    """
+    Aplica un parser por líneas a todo el archivo, repartiéndolo entre varios procesos
+    cuando se piden y el archivo es lo bastante grande como para compensar el coste de arrancarlos.
+
+    Args:
+        parsear (callable): Función parsear(ruta, inicio, fin) -> (eventos, líneas inválidas).
+        ruta (str): Ruta del archivo.
+        procesos (int, optional): Número máximo de procesos; por defecto, solo el actual.
+
+    Returns:
+        tuple: (eventos normalizados como Evento, líneas inválidas).
+    """
+    tamano = os.path.getsize(ruta)
+    if procesos < 2 or tamano < _TAM_MIN_PARALELO:
+        return parsear(ruta, 0, tamano)
+    limites = _limites_de_trozos(ruta, tamano, procesos)
+    datos = []
+    lineas_invalidas = 0
+    with ProcessPoolExecutor(max_workers=procesos) as ejecutor:
+        for *columnas, invalidas in ejecutor.map(_parsear_en_columnas, repeat(parsear), repeat(ruta),
+                                                 limites[:-1], limites[1:]):
+            datos.extend(map(Evento, *columnas))
+            lineas_invalidas += invalidas
+    return datos, lineas_invalidas
+
+def _lineas_universales(mapa, inicio, fin):
+    """
+    Divide un trozo del archivo con saltos de línea universales (\n, \r\n y \r suelto),
+    como la lectura en modo texto.
+
+    Solo hace falta si el trozo tiene algún \r suelto (ver _CR_SUELTO_RE); si no, basta con
+    dividir por \n, que es más rápido.
+
+    Args:
+        mapa (mmap.mmap): Contenido del archivo.
+        inicio (int): Offset de la primera línea del trozo.
+        fin (int): Offset donde empieza la primera línea que ya no pertenece al trozo.
+
+    Returns:
+        list: Líneas en bytes, sin el salto de línea final.
+    """
+    lineas = _SALTO_UNIVERSAL_RE.split(mapa[inicio:fin])
+    if not lineas[-1]:
+        lineas.pop()
+    return lineas
+
+def _lineas_de_trozo(mapa, inicio, fin):
+    """
+    Recorre las líneas de un trozo del archivo proyectado en memoria.
+
+    Args:
+        mapa (mmap.mmap or io.BytesIO): Contenido del archivo.
+        inicio (int): Offset de la primera línea del trozo.
+        fin (int): Offset donde empieza la primera línea que ya no pertenece al trozo.
+
+    Yields:
+        bytes: Cada línea, con su salto de línea final (sin él si el trozo tiene algún \r suelto).
+    """
+    if fin > inicio and _CR_SUELTO_RE.search(mapa, inicio, fin):
+        yield from _lineas_universales(mapa, inicio, fin)
+        return
+    posicion = inicio
+    mapa.seek(inicio)
+    for linea in iter(mapa.readline, b""):
+        if posicion >= fin:
+            break
+        posicion += len(linea)
+        yield linea
+
+def _parsear_json(ruta, inicio, fin):
+    """
+    Normaliza las líneas NDJSON de un trozo del archivo.
 
     Args:
         ruta (str): Ruta del archivo JSON.
+        inicio (int): Offset de la primera línea del trozo.
+        fin (int): Offset donde empieza la primera línea que ya no pertenece al trozo.
 
     Returns:
-        list: Lista de eventos normalizados.
+        tuple: (eventos normalizados como Evento, líneas inválidas).
     """
-    if not ruta.endswith(".json"):
-        print(" Atención: el archivo no tiene extensión .json")
     datos = []
     lineas_invalidas = 0
-    with open(ruta, encoding="utf-8", errors="ignore") as f:
-        for linea in f:
-            linea = linea.strip()
-            if not linea:
-                continue
+    with _mapear_archivo(ruta) as mapa:
+        for linea in _lineas_de_trozo(mapa, inicio, fin):
+            # json y orjson ya ignoran espacios, tabuladores y saltos de línea en los extremos
             try:
-                obj = json.loads(linea)
-                datos.append({
-                    "timestamp": normalizar_timestamp(obj.get("timestamp", "")),
-                    "host": obj.get("agent", {}).get("name", obj.get("manager", {}).get("name", "")),
-                    "process": obj.get("predecoder", {}).get("program_name",
-                                  obj.get("decoder", {}).get("name", "unknown")),
-                    "message": obj.get("full_log", ""),
-                    "severity": normalizar_severity(obj.get("rule", {}).get("level", 0))
-                })
-            except json.JSONDecodeError:
-                lineas_invalidas += 1
+                obj = _json_loads(linea)
+            except ValueError:
+                # JSONDecodeError (json u orjson) o UTF-8 inválido: se reintenta como la lectura
+                # original (errors="ignore", strip() de cualquier espacio y el módulo json, que admite
+                # NaN/Infinity y surrogates sueltos que orjson rechaza), para no perder la alerta
+                texto = linea.decode("utf-8", "ignore").strip()
+                if not texto:
+                    continue
+                try:
+                    obj = json.loads(texto)
+                except ValueError:
+                    lineas_invalidas += 1
+                    continue
+            datos.append(Evento(
+                timestamp=normalizar_timestamp(obj.get("timestamp", "")),
+                host=obj.get("agent", {}).get("name", obj.get("manager", {}).get("name", "")),
+                process=obj.get("predecoder", {}).get("program_name",
+                              obj.get("decoder", {}).get("name", "unknown")),
+                message=obj.get("full_log", ""),
+                severity=normalizar_severity(obj.get("rule", {}).get("level", 0))
+            ))
+    return datos, lineas_invalidas
+
+def procesar_json(ruta, procesos=1):
+    """
+    Procesa un archivo JSON o NDJSON de logs y normaliza los eventos.
+
+    Args:
+        ruta (str): Ruta del archivo JSON.
+        procesos (int, optional): Procesos a usar en archivos grandes; por defecto, solo el actual.
+
+    Returns:
+        list: Lista de eventos normalizados (Evento).
+    """
+    if not ruta.endswith(".json"):
+        print(" Atención: el archivo no tiene extensión .json")
+    datos, lineas_invalidas = _procesar_por_trozos(_parsear_json, ruta, procesos)
     print(f" JSON/NDJSON cargado con {len(datos)} eventos normalizados, {lineas_invalidas} líneas inválidas.")
     return datos
 
-def procesar_syslog(ruta):
+def _lineas_syslog(mapa, inicio, fin):
     """
-    Procesa un archivo SYSLOG (.log) y normaliza los eventos.
+    Recorre un trozo del archivo SYSLOG buscando las líneas canónicas con una sola pasada
+    de _SYSLOG_CANONICO_RE sobre el buffer, en lugar de un match por línea.
+
+    Equivale a parser_fast.dividir_lineas_syslog: las líneas que no encajan se devuelven
+    sin procesar, en su posición, para que se les aplique la ruta línea a línea.
+
+    Args:
+        mapa (mmap.mmap): Contenido del archivo.
+        inicio (int): Offset de la primera línea del trozo.
+        fin (int): Offset donde empieza la primera línea que ya no pertenece al trozo.
+
+    Yields:
+        tuple or bytes: (timestamp, host, proceso, mensaje), o la línea en bytes.
+    """
+    siguiente = inicio
+    for match in _SYSLOG_CANONICO_RE.finditer(mapa, inicio, fin):
+        if match.start() > siguiente:
+            yield from mapa[siguiente:match.start() - 1].split(b"\n")
+        ts, host, proceso, mensaje = match.groups()
+        yield ts.decode("ascii"), host.decode("ascii"), proceso.decode("ascii"), mensaje.decode("utf-8", "ignore")
+        siguiente = match.end() + 1
+    if fin > siguiente:
+        resto = mapa[siguiente:fin]
+        yield from resto.split(b"\n")[:-1] if resto.endswith(b"\n") else resto.split(b"\n")
+
+def _parsear_syslog(ruta, inicio, fin):
+    """
+    Normaliza las líneas SYSLOG de un trozo del archivo.
+
+    Las líneas canónicas se localizan en bloque (con parser_fast si está compilado o con
+    _SYSLOG_CANONICO_RE) y solo el resto pasa por _dividir_syslog y _SYSLOG_RE. Si el trozo tiene
+    algún \r suelto, se divide con saltos de línea universales y todas las líneas van por esta ruta.
 
     Args:
         ruta (str): Ruta del archivo SYSLOG.
+        inicio (int): Offset de la primera línea del trozo.
+        fin (int): Offset donde empieza la primera línea que ya no pertenece al trozo.
 
     Returns:
-        list: Lista de eventos normalizados.
+        tuple: (eventos normalizados como Evento, líneas inválidas).
     """
-    if not ruta.endswith(".log"):
-        print(" Atención: el archivo no tiene extensión .log")
     datos = []
-    regex = re.compile(r'^(\w+\s+\d+\s+\d+:\d+:\d+)\s+(\S+)\s+([^:]+):\s+(.*)$')
     lineas_invalidas = 0
-    with open(ruta, encoding="utf-8", errors="ignore") as f:
-        for linea in f:
-            match = regex.match(linea.strip())
-            if match:
-                datos.append({
-                    "timestamp": normalizar_timestamp(match.group(1)),
-                    "host": match.group(2),
-                    "process": match.group(3),
-                    "message": match.group(4),
-                    "severity": 0
-                })
+    if fin <= inicio:
+        return datos, lineas_invalidas
+    with _mapear_archivo(ruta) as mapa:
+        if _CR_SUELTO_RE.search(mapa, inicio, fin):
+            # Con algún \r suelto todas las líneas pasan por la ruta línea a línea
+            lineas = _lineas_universales(mapa, inicio, fin)
+        elif PARSER_FAST_SUPPORT:
+            lineas = dividir_lineas_syslog(mapa, inicio, fin)
+        else:
+            lineas = _lineas_syslog(mapa, inicio, fin)
+        for linea in lineas:
+            if type(linea) is tuple:
+                campos = linea
             else:
-                lineas_invalidas += 1
+                linea = linea.decode("utf-8", errors="ignore").rstrip()
+                try:
+                    campos = _dividir_syslog(linea)
+                except ValueError:
+                    match = _SYSLOG_RE.match(linea)
+                    if not match:
+                        lineas_invalidas += 1
+                        continue
+                    campos = match.groups()
+            datos.append(Evento(
+                timestamp=normalizar_timestamp(campos[0]),
+                host=campos[1],
+                process=campos[2],
+                message=campos[3],
+                severity=0
+            ))
+    return datos, lineas_invalidas
+
+def procesar_syslog(ruta, procesos=1):
+    """
+    Procesa un archivo SYSLOG (.log) y normaliza los eventos.
+
+    Args:
+        ruta (str): Ruta del archivo SYSLOG.
+        procesos (int, optional): Procesos a usar en archivos grandes; por defecto, solo el actual.
+
+    Returns:
+        list: Lista de eventos normalizados (Evento).
+    """
+    if not ruta.endswith(".log"):
+        print(" Atención: el archivo no tiene extensión .log")
+    datos, lineas_invalidas = _procesar_por_trozos(_parsear_syslog, ruta, procesos)
     print(f" SYSLOG cargado con {len(datos)} eventos normalizados, {lineas_invalidas} líneas inválidas.")
     return datos
 
+def _campos_evtx(registro):
+    """
+    Extrae los campos de un registro EVTX, con XPath precompilado si lxml está disponible
+    o con ElementTree en caso contrario.
+
+    Args:
+        registro (Evtx.Evtx.Record): Registro EVTX.
+
+    Returns:
+        dict: Valores en texto de timestamp, host, process, message y severity ("" si faltan).
+    """
+    if LXML_SUPPORT:
+        raiz = registro.lxml()
+        return {campo: xpath(raiz) for campo, xpath in _XPATH_EVTX.items()}
+    raiz = ET.fromstring(registro.xml())
+    creado = raiz.find("e:System/e:TimeCreated", _NS_EVTX)
+    proveedor = raiz.find("e:System/e:Provider", _NS_EVTX)
+    return {
+        "timestamp": creado.get("SystemTime", "") if creado is not None else "",
+        "host": raiz.findtext("e:System/e:Computer", "", _NS_EVTX),
+        "process": proveedor.get("Name", "") if proveedor is not None else "",
+        "message": raiz.findtext("e:RenderingInfo/e:Message", "", _NS_EVTX),
+        "severity": raiz.findtext("e:System/e:Level", "", _NS_EVTX)
+    }
+
 def procesar_evtx(ruta):
     """
     Procesa un archivo EVTX de Windows y normaliza los eventos.
@@ -218,7 +803,7 @@ def procesar_evtx(ruta):
         ruta (str): Ruta del archivo EVTX.
 
     Returns:
-        list: Lista de eventos normalizados.
+        list: Lista de eventos normalizados (Evento).
     """
     if not EVTX_SUPPORT:
         print(" Soporte EVTX no disponible. Instala 'python-evtx'")
@@ -229,14 +814,14 @@ def procesar_evtx(ruta):
         with Evtx(ruta) as evtx:
             for registro in evtx.records():
                 try:
-                    xml = ET.fromstring(registro.xml())
-                    datos.append({
-                        "timestamp": normalizar_timestamp(xml.findtext(".//TimeCreated/@SystemTime") or ""),
-                        "host": xml.findtext(".//Computer") or "",
-                        "process": xml.findtext(".//Provider/@Name") or "unknown",
-                        "message": xml.findtext(".//Message") or "",
-                        "severity": normalizar_severity(xml.findtext(".//Level") or 0)
-                    })
+                    campos = _campos_evtx(registro)
+                    datos.append(Evento(
+                        timestamp=normalizar_timestamp(campos["timestamp"]),
+                        host=campos["host"],
+                        process=campos["process"] or "unknown",
+                        message=campos["message"],
+                        severity=normalizar_severity(campos["severity"] or 0)
+                    ))
                 except Exception:
                     lineas_invalidas += 1
         print(f" EVTX cargado con {len(datos)} eventos normalizados, {lineas_invalidas} líneas inválidas.")
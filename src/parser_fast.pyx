@@ -0,0 +1,109 @@
+# cython: language_level=3, boundscheck=False, wraparound=False
+"""
+Módulo parser_fast.pyx
+
+Versión compilada (Cython) de la división de líneas SYSLOG que hace parser._dividir_syslog.
+Recorre el buffer del archivo (mmap) byte a byte, sin crear un objeto por línea ni pasar por
+el intérprete, y solo construye cadenas para los campos de las líneas aceptadas.
+
+Es opcional: si no está compilado, parser.py usa la implementación en Python.
+Compilación: cythonize -i src/parser_fast.pyx
+"""
+
+from cpython.bytes cimport PyBytes_FromStringAndSize
+from cpython.unicode cimport PyUnicode_DecodeASCII, PyUnicode_DecodeUTF8
+
+cdef inline bint _es_espacio(unsigned char c):
+    # Mismos caracteres ASCII que str.isspace()
+    return c == 32 or 9 <= c <= 13 or 28 <= c <= 31
+
+cdef inline bint _es_digito(unsigned char c):
+    return 48 <= c <= 57
+
+cdef inline bint _es_letra(unsigned char c):
+    return 65 <= c <= 90 or 97 <= c <= 122
+
+def dividir_lineas_syslog(const unsigned char[:] buf, Py_ssize_t inicio, Py_ssize_t fin):
+    """
+    Divide las líneas SYSLOG de un trozo del buffer.
+
+    Solo resuelve aquí las líneas canónicas y completamente ASCII en la cabecera, host y proceso;
+    el resto se devuelven sin procesar para que parser.py les aplique la ruta en Python
+    (_dividir_syslog y _SYSLOG_RE), de modo que el resultado es idéntico.
+
+    Args:
+        buf: Buffer de solo lectura con el contenido del archivo.
+        inicio (int): Offset de la primera línea del trozo.
+        fin (int): Offset donde empieza la primera línea que ya no pertenece al trozo.
+
+    Returns:
+        list: Por cada línea, en orden, una tupla (timestamp, host, proceso, mensaje) o los bytes
+        de la línea si hay que procesarla en Python.
+    """
+    cdef Py_ssize_t n = buf.shape[0]
+    cdef Py_ssize_t linea = inicio, salto, final, i, fin_host, fin_proceso, msg
+    cdef const char *base
+    cdef list resultado = []
+    cdef bint valida
+
+    if n == 0:
+        return resultado
+    base = <const char *> &buf[0]
+    while linea < fin and linea < n:
+        salto = linea
+        while salto < n and buf[salto] != 10:
+            salto += 1
+
+        # rstrip(): si el último byte no es ASCII podría ser un espacio Unicode o UTF-8 inválido
+        final = salto
+        while final > linea and _es_espacio(buf[final - 1]):
+            final -= 1
+        valida = final - linea > 17 and buf[final - 1] < 128
+
+        # Cabecera 'Mmm dd hh:mm:ss ': mes de tres letras, día con espacio o dígito inicial y dígitos
+        if valida:
+            valida = (_es_letra(buf[linea]) and _es_letra(buf[linea + 1]) and _es_letra(buf[linea + 2])
+                      and buf[linea + 3] == 32
+                      and (buf[linea + 4] == 32 or _es_digito(buf[linea + 4])) and _es_digito(buf[linea + 5])
+                      and buf[linea + 6] == 32
+                      and _es_digito(buf[linea + 7]) and _es_digito(buf[linea + 8]) and buf[linea + 9] == 58
+                      and _es_digito(buf[linea + 10]) and _es_digito(buf[linea + 11]) and buf[linea + 12] == 58
+                      and _es_digito(buf[linea + 13]) and _es_digito(buf[linea + 14]) and buf[linea + 15] == 32)
+
+        # Host: caracteres imprimibles sin espacios hasta el siguiente espacio
+        if valida:
+            i = linea + 16
+            while i < final and 33 <= buf[i] <= 126:
+                i += 1
+            fin_host = i
+            valida = fin_host > linea + 16 and fin_host < final and buf[fin_host] == 32
+
+        # Proceso: hasta el primer ':', sin espacio inicial
+        if valida:
+            i = fin_host + 1
+            valida = not _es_espacio(buf[i])
+            while valida and i < final and buf[i] != 58:
+                valida = buf[i] < 128
+                i += 1
+            fin_proceso = i
+            valida = valida and fin_proceso > fin_host + 1 and fin_proceso < final - 1
+
+        # Mensaje: separado por espacios y sin espacios Unicode al principio
+        if valida:
+            msg = fin_proceso + 1
+            valida = _es_espacio(buf[msg])
+            while valida and _es_espacio(buf[msg]):
+                msg += 1
+            valida = valida and buf[msg] < 128
+
+        if valida:
+            resultado.append((
+                PyUnicode_DecodeASCII(base + linea, 15, NULL),
+                PyUnicode_DecodeASCII(base + linea + 16, fin_host - linea - 16, NULL),
+                PyUnicode_DecodeASCII(base + fin_host + 1, fin_proceso - fin_host - 1, NULL),
+                PyUnicode_DecodeUTF8(base + msg, final - msg, "ignore")
+            ))
+        else:
+            resultado.append(PyBytes_FromStringAndSize(base + linea, salto - linea))
+        linea = salto + 1
+    return resultado
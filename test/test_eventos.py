@@ -0,0 +1,67 @@
+"""
+Pruebas del almacenamiento por columnas y de la exportación/importación Parquet.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import eventos  # noqa: E402
+from eventos import ColumnasEventos, Evento  # noqa: E402
+
+def _columnas(*lista):
+    datos = ColumnasEventos()
+    datos.extender(list(lista), "JSON")
+    return datos
+
+def _filas(datos):
+    return [datos[i] for i in range(len(datos))]
+
+@unittest.skipUnless(eventos.PARQUET_SUPPORT, "pyarrow no está instalado")
+class TestParquet(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.ruta = os.path.join(self.directorio.name, "eventos.parquet")
+
+    def test_ida_y_vuelta(self):
+        datos = _columnas(Evento("2025-01-01T00:00:00", "h1", "sshd", "á é", 3),
+                          Evento("Sep 02", "h2", "cron", "", 10))
+        self.assertTrue(eventos.exportar_parquet(datos, self.ruta))
+        leidos = ColumnasEventos()
+        self.assertEqual(eventos.importar_parquet(self.ruta, leidos), 2)
+        self.assertEqual(_filas(leidos), _filas(datos))
+
+    def test_valores_que_no_son_texto(self):
+        # Un JSON puede traer un full_log numérico o un agent.name que no es una cadena
+        datos = _columnas(Evento("", 7, "unknown", 12345, 0), Evento("", None, "p", "m", 1))
+        self.assertTrue(eventos.exportar_parquet(datos, self.ruta))
+        leidos = ColumnasEventos()
+        eventos.importar_parquet(self.ruta, leidos)
+        self.assertEqual(leidos.hosts, ["7", None])
+        self.assertEqual(leidos.messages, ["12345", "m"])
+
+    def test_severidad_invalida_no_desalinea_columnas(self):
+        for severidad in (None, 300):
+            with self.subTest(severidad=severidad):
+                pa = eventos.pa
+                eventos.pq.write_table(pa.table({
+                    "timestamp": ["t", "t"], "host": ["h", "h"], "process": ["p", "p"],
+                    "message": ["m", "m"], "severity": pa.array([1, severidad], pa.int64()),
+                    "log_type": ["JSON", "JSON"]
+                }), self.ruta)
+                leidos = _columnas(Evento("t0", "h0", "p0", "m0", 2))
+                self.assertEqual(eventos.importar_parquet(self.ruta, leidos), 0)
+                self.assertEqual(_filas(leidos), [Evento("t0", "h0", "p0", "m0", 2, "JSON")])
+
+    def test_ruta_no_escribible(self):
+        datos = _columnas(Evento("t", "h", "p", "m", 0))
+        ruta = os.path.join(self.directorio.name, "no_existe", "eventos.parquet")
+        self.assertFalse(eventos.exportar_parquet(datos, ruta))
+
+if __name__ == "__main__":
+    unittest.main()
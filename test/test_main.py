@@ -0,0 +1,63 @@
+"""
+Pruebas del modo por lotes (--ingest) y de sus códigos de salida.
+"""
+
+import os
+import sys
+import tempfile
+import unittest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import main  # noqa: E402
+from eventos import PARQUET_SUPPORT, ColumnasEventos, importar_parquet  # noqa: E402
+
+class TestIngestaPorLotes(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def _archivo(self, carpeta, nombre, datos):
+        ruta = os.path.join(self.directorio.name, carpeta, nombre)
+        os.makedirs(os.path.dirname(ruta), exist_ok=True)
+        with open(ruta, "wb") as f:
+            f.write(datos)
+        return ruta
+
+    def test_archivos_cargados(self):
+        ruta = self._archivo("a", "auth.log", b"Sep  2 17:38:51 host sshd[1]: m\n")
+        main.main(["--ingest", f"syslog:{ruta}"])
+
+    def test_archivo_inexistente(self):
+        ruta = self._archivo("a", "auth.log", b"Sep  2 17:38:51 host sshd[1]: m\n")
+        with self.assertRaises(SystemExit) as salida:
+            main.main(["--ingest", f"syslog:{ruta}", f"syslog:{ruta}.no_existe"])
+        self.assertEqual(salida.exception.code, 1)
+
+    def test_sin_eventos(self):
+        ruta = self._archivo("a", "vacio.log", b"")
+        with self.assertRaises(SystemExit) as salida:
+            main.main(["--ingest", f"syslog:{ruta}"])
+        self.assertEqual(salida.exception.code, 1)
+
+    def test_mismo_nombre_en_distintas_carpetas(self):
+        archivos = [
+            ("syslog", self._archivo("a", "auth.log", b"Sep  2 17:38:51 host1 sshd[1]: m\n")),
+            ("syslog", self._archivo("b", "auth.log", b"Sep  2 17:38:52 host2 sshd[2]: m\n")),
+        ]
+        datos = ColumnasEventos()
+        self.assertEqual(main.ingesta_por_lotes(archivos, datos, 1), 0)
+        self.assertEqual(datos.hosts, ["host1", "host2"])
+
+    @unittest.skipUnless(PARQUET_SUPPORT, "pyarrow no está instalado")
+    def test_fallo_parcial_exporta_antes_de_salir(self):
+        ruta = self._archivo("a", "auth.log", b"Sep  2 17:38:51 host sshd[1]: m\n")
+        parquet = os.path.join(self.directorio.name, "eventos.parquet")
+        with self.assertRaises(SystemExit) as salida:
+            main.main(["--ingest", f"syslog:{ruta}", f"json:{ruta}.no_existe", "--parquet", parquet])
+        self.assertEqual(salida.exception.code, 1)
+        self.assertEqual(importar_parquet(parquet, ColumnasEventos()), 1)
+
+if __name__ == "__main__":
+    unittest.main()
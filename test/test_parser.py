@@ -0,0 +1,348 @@
+"""
+Pruebas del parser SYSLOG y JSON.
+
+Las líneas SYSLOG se dividen por tres vías distintas (_dividir_syslog, _SYSLOG_CANONICO_RE sobre el
+buffer y parser_fast si está compilado) y los archivos grandes se reparten por trozos entre procesos.
+Todas deben dar exactamente los mismos eventos que la expresión regular original línea a línea.
+"""
+
+import io
+import os
+import re
+import sys
+import tempfile
+import unittest
+from datetime import datetime
+from unittest import mock
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+import parser  # noqa: E402
+
+# Líneas que deben aceptarse, rechazarse o pasar por _SYSLOG_RE
+_LINEAS_SYSLOG = [
+    b"Sep  2 17:38:51 host sshd[123]: Accepted password for root",
+    b"Sep 12 01:02:03 host cron[1]: (root) CMD (run-parts)",
+    b"Oct 1 1:2:3 host proceso con espacios: mensaje",
+    b"Sep  2 17:38:51 host proc:\tmensaje con tabulador",
+    b"Sep  2 17:38:51 host proc:   mensaje   ",
+    # Cabeceras que no son un timestamp
+    b"abc de fg:hi:jk host proc: msg",
+    b"--- -- --:--:-- h p: m",
+    b"Se  02 17:[8:51 host proc: m",
+    b"Sep 02 017:38:51 host proc: m",
+    # No ASCII y UTF-8 inválido
+    "Sép  2 17:38:51 host proc: m".encode(),
+    "Sep  ٢ 17:38:51 host proc: m".encode(),
+    "Sep  2 17:38:51 hóst proc: mensaje".encode(),
+    "Sep  2 17:38:51 host proc: mensaje con acentos: á é".encode(),
+    "Sep  2 17:38:51 host proc:　mensaje".encode(),
+    b"Sep  2 17:38:51 host proc: mensaje\xff",
+    b"Sep  2 17:38:51 ho\xffst proc: m",
+    # CRLF, espacios y líneas incompletas
+    b"Sep  2 17:38:51 host proc: con CRLF\r",
+    b"Sep  2 17:38:51 host\tproc: m",
+    b"  Sep  2 17:38:51 host proc: sangrada",
+    b"Sep  2 17:38:51 host proc:sin espacio",
+    b"Sep  2 17:38:51 host proc:",
+    b"Sep  2 17:38:51",
+    b"",
+    b"   ",
+]
+
+# Expresión del parser original, siempre con el módulo re: parser._SYSLOG_RE usa RE2 si está instalado
+_SYSLOG_RE_ORIGINAL = re.compile(r'^(\w+\s+\d+\s+\d+:\d+:\d+)\s+(\S+)\s+([^:]+):\s+(.*)$')
+
+def _eventos(eventos):
+    return [(e.timestamp, e.host, e.process, e.message, e.severity) for e in eventos]
+
+def _esperado_syslog(datos):
+    """Eventos que da el parser original: _SYSLOG_RE_ORIGINAL aplicado línea a línea."""
+    esperado = []
+    # Lectura en modo texto, con saltos de línea universales, como el parser original
+    for linea in io.TextIOWrapper(io.BytesIO(datos), encoding="utf-8", errors="ignore"):
+        match = _SYSLOG_RE_ORIGINAL.match(linea.rstrip())
+        if match:
+            ts, host, proceso, mensaje = match.groups()
+            esperado.append((parser.normalizar_timestamp(ts), host, proceso, mensaje, 0))
+    return esperado
+
+class TestSyslog(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def _archivo(self, datos, nombre="prueba.log"):
+        ruta = os.path.join(self.directorio.name, nombre)
+        with open(ruta, "wb") as f:
+            f.write(datos)
+        return ruta
+
+    def _comprobar(self, datos, parser_fast):
+        ruta = self._archivo(datos)
+        with mock.patch.object(parser, "PARSER_FAST_SUPPORT", parser_fast):
+            eventos, _ = parser._parsear_syslog(ruta, 0, len(datos))
+        self.assertEqual(_eventos(eventos), _esperado_syslog(datos))
+
+    def test_dividir_syslog_coincide_con_regex(self):
+        for linea in _LINEAS_SYSLOG:
+            texto = linea.decode("utf-8", errors="ignore").rstrip()
+            with self.subTest(linea=linea):
+                try:
+                    campos = parser._dividir_syslog(texto)
+                except ValueError:
+                    continue
+                match = _SYSLOG_RE_ORIGINAL.match(texto)
+                self.assertIsNotNone(match)
+                self.assertEqual(campos, match.groups())
+
+    def test_cabeceras_no_validas_se_rechazan(self):
+        for linea in (b"abc de fg:hi:jk host proc: msg", b"--- -- --:--:-- h p: m",
+                      b"Se  02 17:[8:51 host proc: m"):
+            with self.subTest(linea=linea):
+                self.assertEqual(parser.procesar_syslog(self._archivo(linea + b"\n")), [])
+
+    def test_buffer_python_coincide_con_regex(self):
+        datos = b"\n".join(_LINEAS_SYSLOG)
+        self._comprobar(datos, False)
+        self._comprobar(datos + b"\n", False)
+
+    @unittest.skipUnless(parser.PARSER_FAST_SUPPORT, "parser_fast no está compilado")
+    def test_parser_fast_coincide_con_regex(self):
+        datos = b"\n".join(_LINEAS_SYSLOG)
+        self._comprobar(datos, True)
+        self._comprobar(datos + b"\n", True)
+
+    def test_retorno_de_carro_suelto_separa_lineas(self):
+        datos = (b"Sep  2 17:38:51 h p: a\rSep  2 17:38:52 h p: b\r"
+                 b"Sep  2 17:38:53 h p: c\r\n\rSep  2 17:38:54 h p: d\n")
+        for parser_fast in {False, parser.PARSER_FAST_SUPPORT}:
+            with self.subTest(parser_fast=parser_fast):
+                self._comprobar(datos, parser_fast)
+        self.assertEqual([e.message for e in parser.procesar_syslog(self._archivo(datos))],
+                         ["a", "b", "c", "d"])
+
+    def test_archivo_vacio(self):
+        self.assertEqual(parser.procesar_syslog(self._archivo(b"")), [])
+        self.assertEqual(parser.procesar_syslog(self._archivo(b"\n\n")), [])
+
+    def test_trozos_coinciden_con_serie(self):
+        datos = b"\n".join(_LINEAS_SYSLOG * 20)
+        ruta = self._archivo(datos)
+        serie = _eventos(parser.procesar_syslog(ruta, procesos=1))
+        with mock.patch.object(parser, "_TAM_MIN_PARALELO", 1):
+            for procesos in (2, 3, 7):
+                with self.subTest(procesos=procesos):
+                    self.assertEqual(_eventos(parser.procesar_syslog(ruta, procesos=procesos)), serie)
+        self.assertEqual(serie, _esperado_syslog(datos))
+
+# Timestamps syslog canónicos, variantes que acepta strptime y valores que no son un timestamp
+_TIMESTAMPS = [
+    "Sep 02 17:38:51", "Sep  2 17:38:51", "Dec 31 23:59:59", "Feb 29 00:00:00",
+    "Sep 2 7:38:51", "sep 02 17:38:51", "Sep 02 17:38:5", "Sep 31 17:38:51",
+    "Sep 02 017:38:51", "Sep 2 17:38:+5", "Sep 02 17:3_8:51", "Sep ٠2 17:38:51",
+    "Sep 02 １7:38:51", " Sep 02 17:38:51", "Sep 02 17:38:51 ", "Sep 02 17:38:51\n",
+    "Sep 02 24:00:00", "Sep -2 17:38:51", "Foo 02 17:38:51", "Sep 02", "2025-01-01T00:00:00Z",
+]
+
+def _timestamp_original(ts):
+    """normalizar_timestamp del parser original, con strptime."""
+    if not ts:
+        return ""
+    try:
+        return datetime.fromisoformat(ts.replace("Z", "+00:00")).isoformat()
+    except ValueError:
+        try:
+            return datetime.strptime(ts, "%b %d %H:%M:%S").isoformat()
+        except ValueError:
+            return ts
+
+class TestTimestamps(unittest.TestCase):
+
+    def test_timestamp_syslog_coincide_con_strptime(self):
+        for ts in _TIMESTAMPS:
+            with self.subTest(ts=ts):
+                try:
+                    convertido = parser._timestamp_syslog(ts)
+                except (KeyError, ValueError):
+                    continue
+                self.assertEqual(convertido, datetime.strptime(ts, "%b %d %H:%M:%S").isoformat())
+
+    def test_formatos_no_canonicos_se_rechazan(self):
+        for ts in ("Sep 02 017:38:51", "Sep 2 17:38:+5", "Sep 02 17:3_8:51", "Sep ٠2 17:38:51",
+                   "Sep 02 １7:38:51", " Sep 02 17:38:51", "Sep 02 17:38:51\n"):
+            with self.subTest(ts=ts):
+                with self.assertRaises(ValueError):
+                    parser._timestamp_syslog(ts)
+
+    def test_normalizar_timestamp_como_el_original(self):
+        for ts in _TIMESTAMPS:
+            with self.subTest(ts=ts):
+                self.assertEqual(parser.normalizar_timestamp(ts), _timestamp_original(ts))
+
+def _fallar(*args):
+    raise OSError("no soportado")
+
+class TestCopiarArchivo(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+        self.datos = os.urandom(300000)
+        self.origen = os.path.join(self.directorio.name, "origen.log")
+        self.destino = os.path.join(self.directorio.name, "destino.log")
+        with open(self.origen, "wb") as f:
+            f.write(self.datos)
+        os.utime(self.origen, (1000000000, 1000000000))
+
+    def _comprobar_copia(self):
+        parser._copiar_archivo(self.origen, self.destino)
+        with open(self.destino, "rb") as f:
+            self.assertEqual(f.read(), self.datos)
+        self.assertEqual(os.stat(self.destino).st_mtime, 1000000000)
+
+    def test_copia_contenido_y_metadatos(self):
+        self._comprobar_copia()
+
+    def test_sin_copy_file_range_usa_sendfile(self):
+        with mock.patch.object(parser.os, "copy_file_range", _fallar, create=True):
+            self._comprobar_copia()
+
+    def test_termina_por_bloques_desde_donde_fallo_el_kernel(self):
+        llamadas = []
+
+        def copiar_una_vez(entrada, salida, cantidad, desde):
+            # Copia un bloque y después falla, como un sistema de archivos que deja de admitirlo
+            if llamadas:
+                raise OSError("no soportado")
+            llamadas.append(desde)
+            return os.write(salida, os.pread(entrada, min(cantidad, 1000), desde))
+
+        with mock.patch.object(parser.os, "copy_file_range", copiar_una_vez, create=True), \
+                mock.patch.object(parser.os, "sendfile", _fallar, create=True):
+            self._comprobar_copia()
+        self.assertEqual(llamadas, [0])
+
+class TestGuardarEnTemporal(unittest.TestCase):
+
+    def setUp(self):
+        self.origen = tempfile.TemporaryDirectory()
+        self.temporal = tempfile.TemporaryDirectory()
+        self.addCleanup(self.origen.cleanup)
+        self.addCleanup(self.temporal.cleanup)
+        parche = mock.patch.object(parser.tempfile, "gettempdir", return_value=self.temporal.name)
+        parche.start()
+        self.addCleanup(parche.stop)
+        self.ruta = os.path.join(self.origen.name, "prueba.log")
+        with open(self.ruta, "wb") as f:
+            f.write(b"Sep  2 17:38:51 host proc: m\n")
+
+    def test_copia_independiente_del_original(self):
+        ruta_temp = parser.guardar_en_temporal(self.ruta)
+        self.assertEqual(ruta_temp, os.path.join(self.temporal.name, "prueba.log"))
+        self.assertFalse(os.path.islink(ruta_temp))
+        # Truncar o rotar el log original no debe afectar a la copia que se parsea
+        open(self.ruta, "wb").close()
+        self.assertEqual(len(parser.procesar_syslog(ruta_temp)), 1)
+
+    def test_sustituye_enlace_antiguo_sin_escribir_en_su_destino(self):
+        otro = os.path.join(self.origen.name, "otro.log")
+        with open(otro, "wb") as f:
+            f.write(b"intacto")
+        os.symlink(otro, os.path.join(self.temporal.name, "prueba.log"))
+        ruta_temp = parser.guardar_en_temporal(self.ruta)
+        self.assertFalse(os.path.islink(ruta_temp))
+        with open(otro, "rb") as f:
+            self.assertEqual(f.read(), b"intacto")
+
+    def test_ruta_inexistente(self):
+        self.assertIsNone(parser.guardar_en_temporal(os.path.join(self.origen.name, "no_existe.log")))
+
+# CSV en los que el lector de Arrow y csv.DictReader podrían discrepar
+_CSV = {
+    "severidades": "timestamp,host,process,message,severity\n"
+                   "Sep 02 17:38:51,h1,p,m,99999999999999999999999\n"
+                   "2025-01-01T00:00:00Z,h2,p,m,７\n"
+                   "x,h3,p,m,٧\nx,h4,p,m,1_0\nx,h5,p,m, +3 \nx,h6,p,m,-99999999999999999999\n",
+    "filas_mal_formadas": "timestamp,host,process,message,severity\nx,corta\nx,h,p,m,4,sobra\nx,h,p,m,3\n",
+    "cabecera_repetida": "timestamp,host,message,host\nt,primero,m,segundo\n",
+    "bom": "\ufefftimestamp,host,message\nSep 02 17:38:51,h,m\n",
+    "cabecera_multilinea": '"time\nstamp",host,message\nt,h,m\n',
+    "crlf_y_multilinea": 'timestamp,host,message\r\nt,h,"a\r\nb"\r\n\r\nt2,h2,m2\r\n',
+    "sin_columnas": "otra,columna\n1,2\n",
+}
+
+def _eventos_csv(ruta, arrow):
+    with mock.patch.object(parser, "ARROW_SUPPORT", arrow):
+        return _eventos(parser.procesar_csv(ruta))
+
+class TestCsv(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def _archivo(self, texto):
+        ruta = os.path.join(self.directorio.name, "prueba.csv")
+        with open(ruta, "w", encoding="utf-8", newline="") as f:
+            f.write(texto)
+        return ruta
+
+    def test_cabecera_repetida_usa_la_ultima_columna(self):
+        eventos = parser.procesar_csv(self._archivo(_CSV["cabecera_repetida"]))
+        self.assertEqual([e.host for e in eventos], ["segundo"])
+
+    @unittest.skipUnless(parser.ARROW_SUPPORT, "pyarrow no está instalado")
+    def test_arrow_coincide_con_modulo_csv(self):
+        for nombre, texto in _CSV.items():
+            with self.subTest(csv=nombre):
+                ruta = self._archivo(texto)
+                self.assertEqual(_eventos_csv(ruta, True), _eventos_csv(ruta, False))
+
+class TestJson(unittest.TestCase):
+
+    def setUp(self):
+        self.directorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directorio.cleanup)
+
+    def _archivo(self, datos):
+        ruta = os.path.join(self.directorio.name, "prueba.json")
+        with open(ruta, "wb") as f:
+            f.write(datos)
+        return ruta
+
+    def test_lineas_como_el_lector_original(self):
+        datos = (b'{"full_log": "a\xffb", "rule": {"level": 3}}\n'
+                 b'\n   \n'
+                 b'\x0c{"full_log": "con salto de pagina"}\n'
+                 b'{roto}\n'
+                 b'{"full_log": "sin salto final"}')
+        eventos = parser.procesar_json(self._archivo(datos))
+        self.assertEqual([(e.message, e.severity) for e in eventos],
+                         [("ab", 3), ("con salto de pagina", 0), ("sin salto final", 0)])
+
+    def test_retorno_de_carro_suelto_separa_lineas(self):
+        datos = b'{"full_log": "a"}\r{"full_log": "b"}\r\r\n{"full_log": "c"}\r'
+        eventos = parser.procesar_json(self._archivo(datos))
+        self.assertEqual([e.message for e in eventos], ["a", "b", "c"])
+
+    def test_valores_que_solo_admite_json(self):
+        # orjson rechaza NaN/Infinity y los surrogates sueltos; el módulo json (el original) no
+        datos = (b'{"full_log": "nan", "rule": {"level": NaN}}\n'
+                 b'{"full_log": "inf", "extra": Infinity}\n'
+                 b'{"full_log": "\\ud800"}\n')
+        eventos = parser.procesar_json(self._archivo(datos))
+        self.assertEqual([e.message for e in eventos], ["nan", "inf", "\ud800"])
+
+    def test_trozos_coinciden_con_serie(self):
+        lineas = [b'{"timestamp": "Sep  2 17:38:51", "agent": {"name": "h%d"}, "full_log": "m", '
+                  b'"rule": {"level": %d}}' % (i, i % 15) for i in range(500)]
+        ruta = self._archivo(b"\n".join(lineas) + b"\n{roto}\n")
+        serie = _eventos(parser.procesar_json(ruta, procesos=1))
+        with mock.patch.object(parser, "_TAM_MIN_PARALELO", 1):
+            self.assertEqual(_eventos(parser.procesar_json(ruta, procesos=3)), serie)
+        self.assertEqual(len(serie), 500)
+
+if __name__ == "__main__":
+    unittest.main()